@@ -25,12 +25,14 @@
     Config,
     DateRange,
     ExtractorError,
+    ISO639Utils,
     InAdvancePagedList,
     LazyList,
     OnDemandPagedList,
     age_restricted,
     args_to_str,
     base_url,
+    bytes_to_long,
     caesar,
     clean_html,
     clean_podcast_url,
@@ -38,6 +40,7 @@
     cli_option,
     cli_valueless_option,
     date_from_str,
+    decode_packed_codes,
     datetime_from_str,
     detect_exe_version,
     determine_ext,
@@ -54,6 +57,7 @@
     fix_xml_ampersands,
     float_or_none,
     format_bytes,
+    format_field,
     get_compatible_ext,
     get_element_by_attribute,
     get_element_by_class,
@@ -70,8 +74,11 @@
     iri_to_uri,
     is_html,
     js_to_json,
+    jwt_decode_hs256,
+    jwt_encode_hs256,
     limit_length,
     locked_file,
+    long_to_bytes,
     lowercase_escape,
     match_str,
     merge_dicts,
@@ -96,6 +103,7 @@
     remove_end,
     remove_quotes,
     remove_start,
+    remove_terminal_sequences,
     render_table,
     replace_extension,
     rot47,
@@ -868,6 +876,15 @@ def test_month_by_name(self):
         self.assertEqual(month_by_name('décembre'), None)
         self.assertEqual(month_by_name('Unknown', 'unknown'), None)
 
+    def test_iso639_utils(self):
+        self.assertEqual(ISO639Utils.short2long('en'), 'eng')
+        self.assertEqual(ISO639Utils.short2long('en-US'), 'eng')
+        self.assertEqual(ISO639Utils.short2long('xx'), None)
+        self.assertEqual(ISO639Utils.long2short('eng'), 'en')
+        self.assertEqual(ISO639Utils.long2short('heb'), 'he')
+        self.assertEqual(ISO639Utils.long2short('yid'), 'yi')
+        self.assertEqual(ISO639Utils.long2short('xxx'), None)
+
     def test_parse_codecs(self):
         self.assertEqual(parse_codecs(''), {})
         self.assertEqual(parse_codecs('avc1.77.30, mp4a.40.2'), {
@@ -1410,6 +1427,11 @@ def test_render_table(self):
             '123    4\n'
             '9999   51')
 
+    def test_remove_terminal_sequences(self):
+        self.assertEqual(remove_terminal_sequences('\033[0;31mred\033[0m'), 'red')
+        self.assertEqual(remove_terminal_sequences('\033[Aup\033[K line\033[0m'), 'up line')
+        self.assertEqual(remove_terminal_sequences('no sequences'), 'no sequences')
+
     def test_match_str(self):
         # Unary
         self.assertFalse(match_str('xy', {'x': 1200}))
@@ -1666,6 +1688,19 @@ def test_cli_bool_option(self):
                 {}, '--check-certificate', 'nocheckcertificate', 'false', 'true', '='),
             [])
 
+    def test_long_to_bytes(self):
+        self.assertEqual(long_to_bytes(0), b'\x00')
+        self.assertEqual(long_to_bytes(0x1234), b'\x12\x34')
+        self.assertEqual(long_to_bytes(0x1234, 4), b'\x00\x00\x12\x34')
+        self.assertEqual(long_to_bytes(0x12345678, 4), b'\x12\x34\x56\x78')
+        self.assertEqual(long_to_bytes(2 ** 64), b'\x01' + b'\x00' * 8)
+
+    def test_bytes_to_long(self):
+        self.assertEqual(bytes_to_long(b''), 0)
+        self.assertEqual(bytes_to_long(b'\x00\x00\x12\x34'), 0x1234)
+        self.assertEqual(bytes_to_long(b'\x01' + b'\x00' * 8), 2 ** 64)
+        self.assertEqual(bytes_to_long(long_to_bytes(0xdeadbeefcafe, 16)), 0xdeadbeefcafe)
+
     def test_ohdave_rsa_encrypt(self):
         N = 0xab86b6371b5318aaa1d3c9e612a9f1264f372323c8c0f19875b5fc3b3fd3afcc1e5bec527aa94bfa85bffc157e4245aebda05389a5357b75115ac94f074aefcd
         e = 65537
@@ -1679,6 +1714,7 @@ def test_pkcs1pad(self):
         padded_data = pkcs1pad(data, 32)
         self.assertEqual(padded_data[:2], [0, 2])
         self.assertEqual(padded_data[28:], [0, 1, 2, 3])
+        self.assertNotIn(0, padded_data[2:28])
 
         self.assertRaises(ValueError, pkcs1pad, data, 8)
 
@@ -1693,6 +1729,15 @@ def test_encode_base_n(self):
         self.assertRaises(ValueError, encode_base_n, 0, 70)
         self.assertRaises(ValueError, encode_base_n, 0, 60, custom_table)
 
+    def test_decode_packed_codes(self):
+        self.assertEqual(
+            decode_packed_codes("eval(function(p,a,c,k,e,d){}('0 1=2;9.a(1)',11,11,'var|x||||||||console|log'.split('|'),0,{}))"),
+            'var x=2;console.log(x)')
+        symbols = '|'.join(['a'] * 62 + ['b'])
+        self.assertEqual(
+            decode_packed_codes(f"}}('0 Z 10',62,63,'{symbols}'.split('|'),0,{{}}))"),
+            'a a b')
+
     def test_caesar(self):
         self.assertEqual(caesar('ace', 'abcdef', 2), 'cea')
         self.assertEqual(caesar('cea', 'abcdef', -2), 'ace')
@@ -1856,6 +1901,15 @@ def test_clean_podcast_url(self):
         self.assertEqual(clean_podcast_url('https://pdst.fm/e/2.gum.fm/chtbl.com/track/chrt.fm/track/34D33/pscrb.fm/rss/p/traffic.megaphone.fm/ITLLC7765286967.mp3?updated=1687282661'), 'https://traffic.megaphone.fm/ITLLC7765286967.mp3?updated=1687282661')
         self.assertEqual(clean_podcast_url('https://pdst.fm/e/https://mgln.ai/e/441/www.buzzsprout.com/1121972/13019085-ep-252-the-deep-life-stack.mp3'), 'https://www.buzzsprout.com/1121972/13019085-ep-252-the-deep-life-stack.mp3')
 
+    def test_jwt_encode_hs256(self):
+        payload = {'sub': '1234567890', 'name': 'John Doe', 'iat': 1516239022}
+        token = jwt_encode_hs256(payload, 'your-256-bit-secret')
+        self.assertEqual(token, (
+            b'eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.'
+            b'eyJzdWIiOiIxMjM0NTY3ODkwIiwibmFtZSI6IkpvaG4gRG9lIiwiaWF0IjoxNTE2MjM5MDIyfQ.'
+            b'SflKxwRJSMeKKF2QT4fwpMeJf36POk6yJV_adQssw5c'))
+        self.assertEqual(jwt_decode_hs256(token.decode()), payload)
+
     def test_LazyList(self):
         it = list(range(10))
 
@@ -1914,6 +1968,16 @@ def test_format_bytes(self):
         self.assertEqual(format_bytes(1024**8), '1.00YiB')
         self.assertEqual(format_bytes(1024**9), '1024.00YiB')
 
+    def test_format_field(self):
+        info = {'id': 'abc', 'count': 0, 'empty': {}, 'nested': {'key': 'value'}}
+        self.assertEqual(format_field(info, 'id', '[%s]'), '[abc]')
+        self.assertEqual(format_field(info, 'count'), '')
+        self.assertEqual(format_field(info, 'count', ignore=None), '0')
+        self.assertEqual(format_field(info, 'empty', ignore=None, default='-'), '-')
+        self.assertEqual(format_field(info, 'missing', default='-'), '-')
+        self.assertEqual(format_field(info, [('nested', 'key')], func=str.upper), 'VALUE')
+        self.assertEqual(format_field('abc'), 'abc')
+
     def test_hide_login_info(self):
         self.assertEqual(Config.hide_login_info(['-u', 'foo', '-p', 'bar']),
                          ['-u', 'PRIVATE', '-p', 'PRIVATE'])
@@ -2254,6 +2318,10 @@ def test_traverse_obj(self):
                          msg='if not `get_all`, return only first matching value')
         self.assertEqual(traverse_obj(_GET_ALL_DATA, ..., get_all=False), [0, 1, 2],
                          msg='do not overflatten if not `get_all`')
+        _visited = []
+        self.assertEqual(traverse_obj(_GET_ALL_DATA, ('key', ..., {lambda x: _visited.append(x) or x or None}), get_all=False), 1,
+                         msg='return first non-None value if not `get_all`')
+        self.assertEqual(_visited, [0, 1], msg='stop traversing after first result if not `get_all`')
 
         # Test casesense behavior
         _CASESENSE_DATA = {
@@ -106,6 +106,7 @@ def find_spec(self, fullname, path=None, target=None):
 
     def invalidate_caches(self):
         dirs_in_zip.cache_clear()
+        _loaded_plugins.clear()
         for package in self.packages:
             if package in sys.modules:
                 del sys.modules[package]
@@ -132,9 +133,16 @@ def load_module(module, module_name, suffix):
         and obj.__name__ in getattr(module, '__all__', [obj.__name__])))
 
 
+_loaded_plugins = {}
+
+
 def load_plugins(name, suffix):
-    classes = {}
+    # Reuse the previous result as long as none of its modules were unloaded
+    module_names, classes = _loaded_plugins.get((name, suffix), (None, None))
+    if module_names is not None and all(module in sys.modules for module in module_names):
+        return classes
 
+    module_names, classes = [], {}
     for finder, module_name, _ in iter_modules(name):
         if any(x.startswith('_') for x in module_name.split('.')):
             continue
@@ -152,6 +160,7 @@ def load_plugins(name, suffix):
         except Exception:
             write_string(f'Error while importing module {module_name!r}\n{traceback.format_exc(limit=-1)}')
             continue
+        module_names.append(module_name)
         classes.update(load_module(module, module_name, suffix))
 
     # Compat: old plugin system using __init__.py
@@ -163,8 +172,10 @@ def load_plugins(name, suffix):
         plugins = importlib.util.module_from_spec(spec)
         sys.modules[spec.name] = plugins
         spec.loader.exec_module(plugins)
+        module_names.append(spec.name)
         classes.update(load_module(plugins, spec.name, suffix))
 
+    _loaded_plugins[name, suffix] = module_names, classes
     return classes
 
 
@@ -1,7 +1,6 @@
 import asyncio
 import atexit
 import base64
-import binascii
 import calendar
 import codecs
 import collections
@@ -42,7 +41,6 @@
 import urllib.error
 import urllib.parse
 import urllib.request
-import xml.etree.ElementTree
 
 from . import traversal
 
@@ -2464,8 +2462,17 @@ def lowercase_escape(s):
         s)
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_urlparse(url):
+    """urllib.parse.urlparse for URLs that are parsed repeatedly. The result is immutable"""
+    return urllib.parse.urlparse(url)
+
+
 def parse_qs(url, **kwargs):
-    return urllib.parse.parse_qs(urllib.parse.urlparse(url).query, **kwargs)
+    return urllib.parse.parse_qs(_cached_urlparse(url).query, **kwargs)
+
+
+_BATCH_COMMENT_RE = re.compile(r'\s#')
 
 
 def read_batch_urls(batch_fd):
@@ -2481,7 +2488,8 @@ def fixup(url):
             return False
         # "#" cannot be stripped out since it is part of the URI
         # However, it can be safely stripped out if following a whitespace
-        return re.split(r'\s#', url, 1)[0].rstrip()
+        mobj = _BATCH_COMMENT_RE.search(url)
+        return (url[:mobj.start()] if mobj else url).rstrip()
 
     with contextlib.closing(batch_fd) as fd:
         return [url for url in map(fixup, fd) if url]
@@ -2501,7 +2509,7 @@ def update_url(url, *, query_update=None, **kwargs):
         if not kwargs and not query_update:
             return url
         else:
-            url = urllib.parse.urlparse(url)
+            url = _cached_urlparse(url)
     if query_update:
         assert 'query' not in kwargs, 'query_update and query cannot be specified at the same time'
         kwargs['query'] = urllib.parse.urlencode({
@@ -2517,10 +2525,11 @@ def update_url_query(url, query):
 
 def _multipart_encode_impl(data, boundary):
     content_type = 'multipart/form-data; boundary=%s' % boundary
+    boundary = boundary.encode('ascii')
 
-    out = b''
+    out = []
     for k, v in data.items():
-        out += b'--' + boundary.encode('ascii') + b'\r\n'
+        out.append(b'--' + boundary + b'\r\n')
         if isinstance(k, str):
             k = k.encode()
         if isinstance(v, str):
@@ -2528,13 +2537,13 @@ def _multipart_encode_impl(data, boundary):
         # RFC 2047 requires non-ASCII field names to be encoded, while RFC 7578
         # suggests sending UTF-8 directly. Firefox sends UTF-8, too
         content = b'Content-Disposition: form-data; name="' + k + b'"\r\n\r\n' + v + b'\r\n'
-        if boundary.encode('ascii') in content:
+        if boundary in content:
             raise ValueError('Boundary overlaps with data')
-        out += content
+        out.append(content)
 
-    out += b'--' + boundary.encode('ascii') + b'--\r\n'
+    out.append(b'--' + boundary + b'--\r\n')
 
-    return out, content_type
+    return b''.join(out), content_type
 
 
 def multipart_encode(data, boundary=None):
@@ -2567,9 +2576,12 @@ def multipart_encode(data, boundary=None):
     return out, content_type
 
 
+_NOT_ITERABLE_LIKE_TYPES = (str, bytes, collections.abc.Mapping)
+
+
 def is_iterable_like(x, allowed_types=collections.abc.Iterable, blocked_types=NO_DEFAULT):
     if blocked_types is NO_DEFAULT:
-        blocked_types = (str, bytes, collections.abc.Mapping)
+        blocked_types = _NOT_ITERABLE_LIKE_TYPES
     return isinstance(x, allowed_types) and not isinstance(x, blocked_types)
 
 
@@ -2577,6 +2589,12 @@ def variadic(x, allowed_types=NO_DEFAULT):
     if not isinstance(allowed_types, (tuple, type)):
         deprecation_warning('allowed_types should be a tuple or a type')
         allowed_types = tuple(allowed_types)
+    if allowed_types is NO_DEFAULT:
+        # Skip the comparatively slow ABC checks for the most common types
+        if type(x) in (list, tuple):
+            return x
+        elif type(x) in (str, bytes, dict):
+            return (x, )
     return x if is_iterable_like(x, blocked_types=allowed_types) else (x, )
 
 
@@ -2603,8 +2621,11 @@ def merge_dicts(*dicts):
     merged = {}
     for a_dict in dicts:
         for k, v in a_dict.items():
-            if (v is not None and k not in merged
-                    or isinstance(v, str) and merged[k] == ''):
+            current = merged.get(k, NO_DEFAULT)
+            if current is NO_DEFAULT:
+                if v is not None:
+                    merged[k] = v
+            elif isinstance(v, str) and current == '':
                 merged[k] = v
     return merged
 
@@ -2642,34 +2663,58 @@ def parse_age_limit(s):
     if m:
         return int(m.group('age'))
     s = s.upper()
-    if s in US_RATINGS:
-        return US_RATINGS[s]
+    age = US_RATINGS.get(s)
+    if age is not None:
+        return age
     m = re.match(r'^TV[_-]?(%s)$' % '|'.join(k[3:] for k in TV_PARENTAL_GUIDELINES), s)
     if m:
         return TV_PARENTAL_GUIDELINES['TV-' + m.group(1)]
     return None
 
 
+_JSONP_PREFIX_RE = re.compile(r'''(?x)
+    (?:window\.)?(?P<func_name>[a-zA-Z0-9_.$]*)
+    (?:\s*&&\s*(?P=func_name))?
+    \s*\(\s*''')
+_JSONP_SUFFIX_RE = re.compile(r';?\s*?(?://[^\n]*)*$')
+
+
 def strip_jsonp(code):
-    return re.sub(
-        r'''(?sx)^
-            (?:window\.)?(?P<func_name>[a-zA-Z0-9_.$]*)
-            (?:\s*&&\s*(?P=func_name))?
-            \s*\(\s*(?P<callback_data>.*)\);?
-            \s*?(?://[^\n]*)*$''',
-        r'\g<callback_data>', code)
+    mobj = _JSONP_PREFIX_RE.match(code)
+    if not mobj:
+        return code
+    # Find the last ")" followed only by an optional ";", whitespace and line comments,
+    # without running a backtracking regex over the whole callback data
+    start, end = mobj.end(), len(code)
+    while True:
+        end = code.rfind(')', start, end)
+        if end == -1:
+            return code
+        mobj = _JSONP_SUFFIX_RE.match(code, end + 1)
+        if mobj:
+            return code[start:end] + code[mobj.end():]
+
+
+_JS_STRING_QUOTES = '\'"`'
+_JS_STRING_RE = '|'.join(rf'{q}(?:\\.|[^\\{q}])*{q}' for q in _JS_STRING_QUOTES)
+_JS_COMMENT_RE = r'/\*(?:(?!\*/).)*?\*/|//[^\n]*\n'
+_JS_SKIP_RE = fr'\s*(?:{_JS_COMMENT_RE})?\s*'
+_JS_INTEGER_TABLE = (
+    (re.compile(fr'(?s)^(0[xX][0-9a-fA-F]+){_JS_SKIP_RE}:?$'), 16),
+    (re.compile(fr'(?s)^(0+[0-7]+){_JS_SKIP_RE}:?$'), 8),
+)
+_JS_TO_JSON_RE = re.compile(rf'''(?sx)
+    {_JS_STRING_RE}|
+    {_JS_COMMENT_RE}|,(?={_JS_SKIP_RE}[\]}}])|
+    void\s0|(?:(?<![0-9])[eE]|[a-df-zA-DF-Z_$])[.a-zA-Z_$0-9]*|
+    \b(?:0[xX][0-9a-fA-F]+|0+[0-7]+)(?:{_JS_SKIP_RE}:)?|
+    [0-9]+(?={_JS_SKIP_RE}:)|
+    !+
+    ''')
 
 
 def js_to_json(code, vars={}, *, strict=False):
     # vars is a dict of var, val pairs to substitute
-    STRING_QUOTES = '\'"`'
-    STRING_RE = '|'.join(rf'{q}(?:\\.|[^\\{q}])*{q}' for q in STRING_QUOTES)
-    COMMENT_RE = r'/\*(?:(?!\*/).)*?\*/|//[^\n]*\n'
-    SKIP_RE = fr'\s*(?:{COMMENT_RE})?\s*'
-    INTEGER_TABLE = (
-        (fr'(?s)^(0[xX][0-9a-fA-F]+){SKIP_RE}:?$', 16),
-        (fr'(?s)^(0+[0-7]+){SKIP_RE}:?$', 8),
-    )
 
     def process_escape(match):
         JSON_PASSTHROUGH_ESCAPES = R'"\bfnrtu'
@@ -2695,13 +2740,16 @@ def fix_kv(m):
         elif v.startswith('/*') or v.startswith('//') or v.startswith('!') or v == ',':
             return ''
 
-        if v[0] in STRING_QUOTES:
+        if v[0] in _JS_STRING_QUOTES:
             v = re.sub(r'(?s)\${([^}]+)}', template_substitute, v[1:-1]) if v[0] == '`' else v[1:-1]
-            escaped = re.sub(r'(?s)(")|\\(.)', process_escape, v)
+            if '\\' in v:
+                escaped = re.sub(r'(?s)(")|\\(.)', process_escape, v)
+            else:  # Without escape sequences, only the double quotes need fixing
+                escaped = v.replace('"', R'\"')
             return f'"{escaped}"'
 
-        for regex, base in INTEGER_TABLE:
-            im = re.match(regex, v)
+        for regex, base in _JS_INTEGER_TABLE:
+            im = regex.match(v)
             if im:
                 i = int(im.group(1), base)
                 return f'"{i}":' if v.endswith(':') else str(i)
@@ -2730,14 +2778,7 @@ def create_map(mobj):
         code = re.sub(r'parseInt\([^\d]+(\d+)[^\d]+\)', r'\1', code)
         code = re.sub(r'\(function\([^)]*\)\s*\{[^}]*\}\s*\)\s*\(\s*(["\'][^)]*["\'])\s*\)', r'\1', code)
 
-    return re.sub(rf'''(?sx)
-        {STRING_RE}|
-        {COMMENT_RE}|,(?={SKIP_RE}[\]}}])|
-        void\s0|(?:(?<![0-9])[eE]|[a-df-zA-DF-Z_$])[.a-zA-Z_$0-9]*|
-        \b(?:0[xX][0-9a-fA-F]+|0+[0-7]+)(?:{SKIP_RE}:)?|
-        [0-9]+(?={SKIP_RE}:)|
-        !+
-        ''', fix_kv, code)
+    return _JS_TO_JSON_RE.sub(fix_kv, code)
 
 
 def qualities(quality_ids):
@@ -2937,22 +2978,22 @@ def parse_codecs(codecs_str):
         str.strip, codecs_str.strip().strip(',').split(','))))
     vcodec, acodec, scodec, hdr = None, None, None, None
     for full_codec in split_codecs:
-        parts = re.sub(r'0+(?=\d)', '', full_codec).split('.')
-        if parts[0] in ('avc1', 'avc2', 'avc3', 'avc4', 'vp9', 'vp8', 'hev1', 'hev2',
-                        'h263', 'h264', 'mp4v', 'hvc1', 'av1', 'theora', 'dvh1', 'dvhe'):
+        parts = (re.sub(r'0+(?=\d)', '', full_codec) if '0' in full_codec else full_codec).split('.')
+        if parts[0] in {'avc1', 'avc2', 'avc3', 'avc4', 'vp9', 'vp8', 'hev1', 'hev2',
+                        'h263', 'h264', 'mp4v', 'hvc1', 'av1', 'theora', 'dvh1', 'dvhe'}:
             if vcodec:
                 continue
             vcodec = full_codec
-            if parts[0] in ('dvh1', 'dvhe'):
+            if parts[0] in {'dvh1', 'dvhe'}:
                 hdr = 'DV'
             elif parts[0] == 'av1' and traversal.traverse_obj(parts, 3) == '10':
                 hdr = 'HDR10'
             elif parts[:2] == ['vp9', '2']:
                 hdr = 'HDR10'
-        elif parts[0] in ('flac', 'mp4a', 'opus', 'vorbis', 'mp3', 'aac', 'ac-4',
-                          'ac-3', 'ec-3', 'eac3', 'dtsc', 'dtse', 'dtsh', 'dtsl'):
+        elif parts[0] in {'flac', 'mp4a', 'opus', 'vorbis', 'mp3', 'aac', 'ac-4',
+                          'ac-3', 'ec-3', 'eac3', 'dtsc', 'dtse', 'dtsh', 'dtsl'}:
             acodec = acodec or full_codec
-        elif parts[0] in ('stpp', 'wvtt'):
+        elif parts[0] in {'stpp', 'wvtt'}:
             scodec = scodec or full_codec
         else:
             write_string(f'WARNING: Unknown codec {full_codec}\n')
@@ -3086,7 +3127,7 @@ def determine_protocol(info_dict):
     elif ext == 'f4m':
         return 'f4m'
 
-    return urllib.parse.urlparse(url).scheme
+    return _cached_urlparse(url).scheme
 
 
 def render_table(header_row, data, delim=False, extra_gap=0, hide_empty=False):
@@ -3095,66 +3136,82 @@ def render_table(header_row, data, delim=False, extra_gap=0, hide_empty=False):
     def width(string):
         return len(remove_terminal_sequences(string).replace('\t', ''))
 
-    def get_max_lens(table):
-        return [max(width(str(v)) for v in col) for col in zip(*table)]
+    def get_max_lens(widths):
+        return [max(col) for col in zip(*widths)]
 
     def filter_using_list(row, filterArray):
         return [col for take, col in itertools.zip_longest(filterArray, row, fillvalue=True) if take]
 
-    max_lens = get_max_lens(data) if hide_empty else []
-    header_row = filter_using_list(header_row, max_lens)
-    data = [filter_using_list(row, max_lens) for row in data]
+    # Widths are computed once per cell and reused for both filtering and padding
+    table = [[str(v) for v in row] for row in [header_row, *data]]
+    widths = [[width(text) for text in row] for row in table]
+
+    if hide_empty:
+        max_lens = get_max_lens(widths[1:])
+        table = [filter_using_list(row, max_lens) for row in table]
+        widths = [filter_using_list(row, max_lens) for row in widths]
 
-    table = [header_row] + data
-    max_lens = get_max_lens(table)
+    max_lens = get_max_lens(widths)
     extra_gap += 1
     if delim:
-        table = [header_row, [delim * (ml + extra_gap) for ml in max_lens]] + data
-        table[1][-1] = table[1][-1][:-extra_gap * len(delim)]  # Remove extra_gap from end of delimiter
-    for row in table:
-        for pos, text in enumerate(map(str, row)):
+        delim_row = [delim * (ml + extra_gap) for ml in max_lens]
+        delim_row[-1] = delim_row[-1][:-extra_gap * len(delim)]  # Remove extra_gap from end of delimiter
+        table.insert(1, delim_row)
+        widths.insert(1, [width(text) for text in delim_row])
+    for row, row_widths in zip(table, widths):
+        for pos, (text, text_width) in enumerate(zip(row, row_widths)):
             if '\t' in text:
-                row[pos] = text.replace('\t', ' ' * (max_lens[pos] - width(text))) + ' ' * extra_gap
+                row[pos] = text.replace('\t', ' ' * (max_lens[pos] - text_width)) + ' ' * extra_gap
             else:
-                row[pos] = text + ' ' * (max_lens[pos] - width(text) + extra_gap)
+                row[pos] = text + ' ' * (max_lens[pos] - text_width + extra_gap)
     ret = '\n'.join(''.join(row).rstrip() for row in table)
     return ret
 
 
+_MATCH_STRING_OPERATORS = {
+    '*=': operator.contains,
+    '^=': lambda attr, value: attr.startswith(value),
+    '$=': lambda attr, value: attr.endswith(value),
+    '~=': lambda attr, value: re.search(value, attr),
+}
+_MATCH_COMPARISON_OPERATORS = {
+    **_MATCH_STRING_OPERATORS,
+    '<=': operator.le,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '>': operator.gt,
+    '=': operator.eq,
+}
+_MATCH_UNARY_OPERATORS = {
+    '': lambda v: (v is True) if isinstance(v, bool) else (v is not None),
+    '!': lambda v: (v is False) if isinstance(v, bool) else (v is None),
+}
+# Longer operators must come first in the alternation so that "<" cannot shadow "<="
+_MATCH_COMPARISON_RE = re.compile(r'''(?x)
+    (?P<key>[a-z_]+)
+    \s*(?P<negation>!\s*)?(?P<op>%s)(?P<none_inclusive>\s*\?)?\s*
+    (?:
+        (?P<quote>["\'])(?P<quotedstrval>.+?)(?P=quote)|
+        (?P<strval>.+?)
+    )
+    ''' % '|'.join(map(re.escape, sorted(_MATCH_COMPARISON_OPERATORS, key=len, reverse=True))))
+_MATCH_AND_RE = re.compile(r'(?<!\\)&')
+_MATCH_UNARY_RE = re.compile(r'''(?x)
+    (?P<op>%s)\s*(?P<key>[a-z_]+)
+    ''' % '|'.join(map(re.escape, _MATCH_UNARY_OPERATORS)))
+
+
 def _match_one(filter_part, dct, incomplete):
     # TODO: Generalize code with YoutubeDL._build_format_filter
-    STRING_OPERATORS = {
-        '*=': operator.contains,
-        '^=': lambda attr, value: attr.startswith(value),
-        '$=': lambda attr, value: attr.endswith(value),
-        '~=': lambda attr, value: re.search(value, attr),
-    }
-    COMPARISON_OPERATORS = {
-        **STRING_OPERATORS,
-        '<=': operator.le,  # "<=" must be defined above "<"
-        '<': operator.lt,
-        '>=': operator.ge,
-        '>': operator.gt,
-        '=': operator.eq,
-    }
-
     if isinstance(incomplete, bool):
         is_incomplete = lambda _: incomplete
     else:
         is_incomplete = lambda k: k in incomplete
 
-    operator_rex = re.compile(r'''(?x)
-        (?P<key>[a-z_]+)
-        \s*(?P<negation>!\s*)?(?P<op>%s)(?P<none_inclusive>\s*\?)?\s*
-        (?:
-            (?P<quote>["\'])(?P<quotedstrval>.+?)(?P=quote)|
-            (?P<strval>.+?)
-        )
-        ''' % '|'.join(map(re.escape, COMPARISON_OPERATORS.keys())))
-    m = operator_rex.fullmatch(filter_part.strip())
+    m = _MATCH_COMPARISON_RE.fullmatch(filter_part.strip())
     if m:
         m = m.groupdict()
-        unnegated_op = COMPARISON_OPERATORS[m['op']]
+        unnegated_op = _MATCH_COMPARISON_OPERATORS[m['op']]
         if m['negation']:
             op = lambda attr, value: not unnegated_op(attr, value)
         else:
@@ -3177,22 +3234,15 @@ def _match_one(filter_part, dct, incomplete):
                     numeric_comparison = parse_filesize(f'{comparison_value}B')
                 if numeric_comparison is None:
                     numeric_comparison = parse_duration(comparison_value)
-        if numeric_comparison is not None and m['op'] in STRING_OPERATORS:
+        if numeric_comparison is not None and m['op'] in _MATCH_STRING_OPERATORS:
             raise ValueError('Operator %s only supports string values!' % m['op'])
         if actual_value is None:
             return is_incomplete(m['key']) or m['none_inclusive']
         return op(actual_value, comparison_value if numeric_comparison is None else numeric_comparison)
 
-    UNARY_OPERATORS = {
-        '': lambda v: (v is True) if isinstance(v, bool) else (v is not None),
-        '!': lambda v: (v is False) if isinstance(v, bool) else (v is None),
-    }
-    operator_rex = re.compile(r'''(?x)
-        (?P<op>%s)\s*(?P<key>[a-z_]+)
-        ''' % '|'.join(map(re.escape, UNARY_OPERATORS.keys())))
-    m = operator_rex.fullmatch(filter_part.strip())
+    m = _MATCH_UNARY_RE.fullmatch(filter_part.strip())
     if m:
-        op = UNARY_OPERATORS[m.group('op')]
+        op = _MATCH_UNARY_OPERATORS[m.group('op')]
         actual_value = dct.get(m.group('key'))
         if is_incomplete(m.group('key')) and actual_value is None:
             return True
@@ -3208,9 +3258,11 @@ def match_str(filter_str, dct, incomplete=False):
                        Can be True/False to indicate all/none of the keys may be missing.
                        All conditions on incomplete keys pass if the key is missing
     """
-    return all(
-        _match_one(filter_part.replace(r'\&', '&'), dct, incomplete)
-        for filter_part in re.split(r'(?<!\\)&', filter_str))
+    if r'\&' not in filter_str:
+        filter_parts = filter_str.split('&')
+    else:
+        filter_parts = (part.replace(r'\&', '&') for part in _MATCH_AND_RE.split(filter_str))
+    return all(_match_one(filter_part, dct, incomplete) for filter_part in filter_parts)
 
 
 def match_filter_func(filters, breaking_filters=None):
@@ -3405,9 +3457,20 @@ def close(self):
 
     def parse_node(node):
         target = TTMLPElementParser()
-        parser = xml.etree.ElementTree.XMLParser(target=target)
-        parser.feed(xml.etree.ElementTree.tostring(node))
-        return parser.close()
+
+        # Walk the already parsed tree instead of serializing and re-parsing it
+        def walk(element, tail=True):
+            target.start(element.tag, element.attrib)
+            if element.text:
+                target.data(element.text)
+            for child in element:
+                walk(child)
+            target.end(element.tag)
+            if tail and element.tail:
+                target.data(element.tail)
+
+        walk(node, tail=False)
+        return target.close()
 
     for k, v in LEGACY_NAMESPACES:
         for ns in v:
@@ -3521,7 +3584,7 @@ def _configuration_args(main_key, argdict, exe, keys=None, default=[], use_compa
 
 class ISO639Utils:
     # See http://www.loc.gov/standards/iso639-2/ISO-639-2_utf-8.txt
-    _lang_map = {
+    _lang_map = types.MappingProxyType({
         'aa': 'aar',
         'ab': 'abk',
         'ae': 'ave',
@@ -3710,7 +3773,10 @@ class ISO639Utils:
         'za': 'zha',
         'zh': 'zho',
         'zu': 'zul',
-    }
+    })
+    # Iterate in reverse so that the first (current) code wins for deprecated duplicates
+    _long_map = types.MappingProxyType({
+        long_name: short_name for short_name, long_name in reversed(list(_lang_map.items()))})
 
     @classmethod
     def short2long(cls, code):
@@ -3720,14 +3786,12 @@ def short2long(cls, code):
     @classmethod
     def long2short(cls, code):
         """Convert language code from ISO 639-2/T to ISO 639-1"""
-        for short_name, long_name in cls._lang_map.items():
-            if long_name == code:
-                return short_name
+        return cls._long_map.get(code)
 
 
 class ISO3166Utils:
     # From http://data.okfn.org/data/core/country-list
-    _country_map = {
+    _country_map = types.MappingProxyType({
         'AF': 'Afghanistan',
         'AX': 'Åland Islands',
         'AL': 'Albania',
@@ -3980,7 +4044,7 @@ class ISO3166Utils:
         # Not ISO 3166 codes, but used for IP blocks
         'AP': 'Asia/Pacific Region',
         'EU': 'Europe',
-    }
+    })
 
     @classmethod
     def short2full(cls, code):
@@ -3988,9 +4052,16 @@ def short2full(cls, code):
         return cls._country_map.get(code.upper())
 
 
+def _ipv4_block_range(block):
+    """Get the (first, last) addresses of an IPv4 CIDR block as integers"""
+    addr, preflen = block.split('/')
+    addr_min = struct.unpack('!L', socket.inet_aton(addr))[0]
+    return addr_min, addr_min | (0xffffffff >> int(preflen))
+
+
 class GeoUtils:
     # Major IPv4 address blocks per country
-    _country_ip_map = {
+    _country_ip_map = types.MappingProxyType({
         'AD': '46.172.224.0/19',
         'AE': '94.200.0.0/13',
         'AF': '149.54.0.0/17',
@@ -4231,21 +4302,21 @@ class GeoUtils:
         'ZA': '41.0.0.0/11',
         'ZM': '102.144.0.0/13',
         'ZW': '102.177.192.0/18',
-    }
+    })
+    _country_ip_ranges = types.MappingProxyType({
+        code: _ipv4_block_range(block) for code, block in _country_ip_map.items()})
 
     @classmethod
     def random_ipv4(cls, code_or_block):
         if len(code_or_block) == 2:
-            block = cls._country_ip_map.get(code_or_block.upper())
-            if not block:
+            addr_range = cls._country_ip_ranges.get(code_or_block.upper())
+            if not addr_range:
                 return None
         else:
-            block = code_or_block
-        addr, preflen = block.split('/')
-        addr_min = struct.unpack('!L', socket.inet_aton(addr))[0]
-        addr_max = addr_min | (0xffffffff >> int(preflen))
+            addr_range = _ipv4_block_range(code_or_block)
+        addr_min, addr_max = addr_range
         return str(socket.inet_ntoa(
-            struct.pack('!L', random.randint(addr_min, addr_max))))
+            struct.pack('!L', random.randrange(addr_min, addr_max + 1))))
 
 
 # Both long_to_bytes and bytes_to_long are adapted from PyCrypto, which is
@@ -4260,26 +4331,11 @@ def long_to_bytes(n, blocksize=0):
     byte string with binary zeros so that the length is a multiple of
     blocksize.
     """
-    # after much testing, this algorithm was deemed to be the fastest
-    s = b''
     n = int(n)
-    while n > 0:
-        s = struct.pack('>I', n & 0xffffffff) + s
-        n = n >> 32
-    # strip off leading zeros
-    for i in range(len(s)):
-        if s[i] != b'\000'[0]:
-            break
-    else:
-        # only happens when n == 0
-        s = b'\000'
-        i = 0
-    s = s[i:]
-    # add back some pad bytes.  this could be done more efficiently w.r.t. the
-    # de-padding being done above, but sigh...
-    if blocksize > 0 and len(s) % blocksize:
-        s = (blocksize - len(s) % blocksize) * b'\000' + s
-    return s
+    length = max(1, (n.bit_length() + 7) // 8)
+    if blocksize > 0 and length % blocksize:
+        length += blocksize - length % blocksize
+    return n.to_bytes(length, 'big')
 
 
 def bytes_to_long(s):
@@ -4288,15 +4344,7 @@ def bytes_to_long(s):
 
     This is (essentially) the inverse of long_to_bytes().
     """
-    acc = 0
-    length = len(s)
-    if length % 4:
-        extra = (4 - length % 4)
-        s = b'\000' * extra + s
-        length = length + extra
-    for i in range(0, length, 4):
-        acc = (acc << 32) + struct.unpack('>I', s[i:i + 4])[0]
-    return acc
+    return int.from_bytes(s, 'big')
 
 
 def ohdave_rsa_encrypt(data, exponent, modulus):
@@ -4311,7 +4359,7 @@ def ohdave_rsa_encrypt(data, exponent, modulus):
     Limitation: supports one block encryption only
     '''
 
-    payload = int(binascii.hexlify(data[::-1]), 16)
+    payload = int.from_bytes(data, 'little')
     encrypted = pow(payload, exponent, modulus)
     return '%x' % encrypted
 
@@ -4327,7 +4375,11 @@ def pkcs1pad(data, length):
     if len(data) > length - 11:
         raise ValueError('Input data too long for PKCS#1 padding')
 
-    pseudo_random = [random.randint(0, 254) for _ in range(length - len(data) - 3)]
+    # The padding string must consist of non-zero octets (RFC 8017 section 7.2.1)
+    pad_length = length - len(data) - 3
+    pseudo_random = []
+    while len(pseudo_random) < pad_length:
+        pseudo_random.extend(filter(None, os.urandom(pad_length - len(pseudo_random))))
     return [0, 2] + pseudo_random + [0] + data
 
 
@@ -4347,11 +4399,11 @@ def encode_base_n(num, n=None, table=None):
     if not num:
         return table[0]
 
-    result, base = '', len(table)
+    result, base = [], len(table)
     while num:
-        result = table[num % base] + result
-        num = num // base
-    return result
+        num, digit = divmod(num, base)
+        result.append(table[digit])
+    return ''.join(reversed(result))
 
 
 def decode_base_n(string, n=None, table=None):
@@ -4363,6 +4415,16 @@ def decode_base_n(string, n=None, table=None):
     return result
 
 
+def _iter_base_n(table):
+    """Yield encode_base_n(0), encode_base_n(1), ... without converting each number"""
+    yield from table
+    for length in itertools.count(1):
+        yield from map(''.join, itertools.product(table[1:], *[table] * length))
+
+
+_PACKED_CODES_WORD_RE = re.compile(r'\b\w+\b')
+
+
 def decode_packed_codes(code):
     mobj = re.search(PACKED_CODES_RE, code)
     obfuscated_code, base, count, symbols = mobj.groups()
@@ -4371,40 +4433,64 @@ def decode_packed_codes(code):
     symbols = symbols.split('|')
     symbol_table = {}
 
-    while count:
-        count -= 1
-        base_n_count = encode_base_n(count, base)
-        symbol_table[base_n_count] = symbols[count] or base_n_count
+    for index, base_n_count in zip(range(count), _iter_base_n(_base_n_table(base, None))):
+        symbol_table[base_n_count] = symbols[index] or base_n_count
 
-    return re.sub(
-        r'\b(\w+)\b', lambda mobj: symbol_table[mobj.group(0)],
-        obfuscated_code)
+    return _PACKED_CODES_WORD_RE.sub(lambda mobj: symbol_table[mobj.group(0)], obfuscated_code)
+
+
+@functools.cache
+def _caesar_table(alphabet, shift):
+    l = len(alphabet)
+    # Iterate in reverse so that the first occurrence wins for duplicated characters
+    return {ord(c): alphabet[(i + shift) % l] for i, c in reversed(list(enumerate(alphabet)))}
 
 
 def caesar(s, alphabet, shift):
     if shift == 0:
         return s
-    l = len(alphabet)
-    return ''.join(
-        alphabet[(alphabet.index(c) + shift) % l] if c in alphabet else c
-        for c in s)
+    return s.translate(_caesar_table(alphabet, shift))
+
+
+_ROT47_TABLE = _caesar_table(r'''!"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\]^_`abcdefghijklmnopqrstuvwxyz{|}~''', 47)
 
 
 def rot47(s):
-    return caesar(s, r'''!"#$%&'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ[\]^_`abcdefghijklmnopqrstuvwxyz{|}~''', 47)
+    return s.translate(_ROT47_TABLE)
+
+
+_M3U8_ATTRIBUTE_RE = re.compile(r'(?P<key>[A-Z0-9-]+)=(?P<val>"[^"]+"|[^",]+)(?:,|$)')
 
 
 def parse_m3u8_attributes(attrib):
     info = {}
-    for (key, val) in re.findall(r'(?P<key>[A-Z0-9-]+)=(?P<val>"[^"]+"|[^",]+)(?:,|$)', attrib):
-        if val.startswith('"'):
+    for (key, val) in _M3U8_ATTRIBUTE_RE.findall(attrib):
+        if val[0] == '"':
             val = val[1:-1]
         info[key] = val
     return info
 
 
 def urshift(val, n):
-    return val >> n if val >= 0 else (val + 0x100000000) >> n
+    return (val & 0xffffffff) >> n
+
+
+@functools.cache
+def _get_setxattr():
+    if getattr(xattr, '_yt_dlp__identifier', None) == 'pyxattr':
+        # Unicode arguments are not supported in pyxattr until version 0.5.0
+        # See https://github.com/ytdl-org/youtube-dl/issues/5498
+        if version_tuple(xattr.__version__) >= (0, 5, 0):
+            return xattr.set
+    elif xattr:
+        return xattr.setxattr
+    return None
+
+
+@functools.cache
+def _get_xattr_executable():
+    return ('setfattr' if check_executable('setfattr', ['--version'])
+            else 'xattr' if check_executable('xattr', ['-h']) else None)
 
 
 def write_xattr(path, key, value):
@@ -4423,15 +4509,7 @@ def write_xattr(path, key, value):
 
     # UNIX Method 1. Use xattrs/pyxattrs modules
 
-    setxattr = None
-    if getattr(xattr, '_yt_dlp__identifier', None) == 'pyxattr':
-        # Unicode arguments are not supported in pyxattr until version 0.5.0
-        # See https://github.com/ytdl-org/youtube-dl/issues/5498
-        if version_tuple(xattr.__version__) >= (0, 5, 0):
-            setxattr = xattr.set
-    elif xattr:
-        setxattr = xattr.setxattr
-
+    setxattr = _get_setxattr()
     if setxattr:
         try:
             setxattr(path, key, value)
@@ -4440,8 +4518,7 @@ def write_xattr(path, key, value):
         return
 
     # UNIX Method 2. Use setfattr/xattr executables
-    exe = ('setfattr' if check_executable('setfattr', ['--version'])
-           else 'xattr' if check_executable('xattr', ['-h']) else None)
+    exe = _get_xattr_executable()
     if not exe:
         raise XAttrUnavailableError(
             'Couldn\'t find a tool to set the xattrs. Install either the python "xattr" or "pyxattr" modules or the '
@@ -4461,7 +4538,7 @@ def write_xattr(path, key, value):
 def random_birthday(year_field, month_field, day_field):
     start_date = datetime.date(1950, 1, 1)
     end_date = datetime.date(1995, 12, 31)
-    offset = random.randint(0, (end_date - start_date).days)
+    offset = random.randrange((end_date - start_date).days + 1)
     random_date = start_date + datetime.timedelta(offset)
     return {
         year_field: str(random_date.year),
@@ -4512,6 +4589,12 @@ def find_available_port(interface=''):
 }
 
 
+@functools.lru_cache(maxsize=256)
+def _idna_encode(hostname):
+    # The 'idna' encoding produces ASCII text
+    return hostname.encode('idna').decode('ascii')
+
+
 def iri_to_uri(iri):
     """
     Converts an IRI (Internationalized Resource Identifier, allowing Unicode characters) to a URI (Uniform Resource Identifier, ASCII-only).
@@ -4527,21 +4610,23 @@ def iri_to_uri(iri):
 
     # The `safe` argument values, that the following code uses, contain the characters that should not be percent-encoded. Everything else but letters, digits and '_.-' will be percent-encoded with an underlying UTF-8 encoding. Everything already percent-encoded will be left as is.
 
-    net_location = ''
+    net_location = []
     if iri_parts.username:
-        net_location += urllib.parse.quote(iri_parts.username, safe=r"!$%&'()*+,~")
+        net_location.append(urllib.parse.quote(iri_parts.username, safe=r"!$%&'()*+,~"))
         if iri_parts.password is not None:
-            net_location += ':' + urllib.parse.quote(iri_parts.password, safe=r"!$%&'()*+,~")
-        net_location += '@'
+            net_location.append(':' + urllib.parse.quote(iri_parts.password, safe=r"!$%&'()*+,~"))
+        net_location.append('@')
 
-    net_location += iri_parts.hostname.encode('idna').decode()  # Punycode for Unicode hostnames.
-    # The 'idna' encoding produces ASCII text.
+    hostname = iri_parts.hostname
+    if not hostname.isascii():
+        hostname = _idna_encode(hostname)  # Punycode for Unicode hostnames.
+    net_location.append(hostname)
     if iri_parts.port is not None and iri_parts.port != 80:
-        net_location += ':' + str(iri_parts.port)
+        net_location.append(f':{iri_parts.port}')
 
     return urllib.parse.urlunparse(
         (iri_parts.scheme,
-            net_location,
+            ''.join(net_location),
 
             urllib.parse.quote_plus(iri_parts.path, safe=r"!$%&'()*+,/:;=@|~"),
 
@@ -4559,38 +4644,56 @@ def iri_to_uri(iri):
 def to_high_limit_path(path):
     if sys.platform in ['win32', 'cygwin']:
         # Work around MAX_PATH limitation on Windows. The maximum allowed length for the individual path segments may still be quite limited.
+        # Absolute paths that already fit, or that carry the prefix, need no rewriting
+        if path.startswith('\\\\?\\') or (os.path.isabs(path) and len(path) < 250):
+            return path
         return '\\\\?\\' + os.path.abspath(path)
 
     return path
 
 
 def format_field(obj, field=None, template='%s', ignore=NO_DEFAULT, default='', func=IDENTITY):
-    val = traversal.traverse_obj(obj, *variadic(field))
+    if isinstance(field, str) and isinstance(obj, dict):
+        # Common case; same result as traverse_obj, which also discards empty dicts
+        val = obj.get(field)
+        if val == {}:
+            val = None
+    else:
+        val = traversal.traverse_obj(obj, *variadic(field))
     if not val if ignore is NO_DEFAULT else val in variadic(ignore):
         return default
     return template % func(val)
 
 
-def clean_podcast_url(url):
-    url = re.sub(r'''(?x)
+_PODCAST_TRACKER_RE = re.compile(r'''(?x)
+    (?:
         (?:
-            (?:
-                chtbl\.com/track|
-                media\.blubrry\.com| # https://create.blubrry.com/resources/podcast-media-download-statistics/getting-started/
-                play\.podtrac\.com|
-                chrt\.fm/track|
-                mgln\.ai/e
-            )(?:/[^/.]+)?|
-            (?:dts|www)\.podtrac\.com/(?:pts/)?redirect\.[0-9a-z]{3,4}| # http://analytics.podtrac.com/how-to-measure
-            flex\.acast\.com|
-            pd(?:
-                cn\.co| # https://podcorn.com/analytics-prefix/
-                st\.fm # https://podsights.com/docs/
-            )/e|
-            [0-9]\.gum\.fm|
-            pscrb\.fm/rss/p
-        )/''', '', url)
-    return re.sub(r'^\w+://(\w+://)', r'\1', url)
+            chtbl\.com/track|
+            media\.blubrry\.com| # https://create.blubrry.com/resources/podcast-media-download-statistics/getting-started/
+            play\.podtrac\.com|
+            chrt\.fm/track|
+            mgln\.ai/e
+        )(?:/[^/.]+)?|
+        (?:dts|www)\.podtrac\.com/(?:pts/)?redirect\.[0-9a-z]{3,4}| # http://analytics.podtrac.com/how-to-measure
+        flex\.acast\.com|
+        pd(?:
+            cn\.co| # https://podcorn.com/analytics-prefix/
+            st\.fm # https://podsights.com/docs/
+        )/e|
+        [0-9]\.gum\.fm|
+        pscrb\.fm/rss/p
+    )/''')
+# Every _PODCAST_TRACKER_RE match contains one of these; most URLs contain none of them
+_PODCAST_TRACKER_HINTS = (
+    'chtbl.com/track', 'media.blubrry.com', 'podtrac.com', 'chrt.fm/track', 'mgln.ai/e',
+    'flex.acast.com', 'pdcn.co/e', 'pdst.fm/e', '.gum.fm', 'pscrb.fm/rss/p')
+_NESTED_SCHEME_RE = re.compile(r'^\w+://(\w+://)')
+
+
+def clean_podcast_url(url):
+    if any(hint in url for hint in _PODCAST_TRACKER_HINTS):
+        url = _PODCAST_TRACKER_RE.sub('', url)
+    return _NESTED_SCHEME_RE.sub(r'\1', url)
 
 
 _HEX_TABLE = '0123456789abcdef'
@@ -4603,7 +4706,8 @@ def random_uuidv4():
 def make_dir(path, to_screen=None):
     try:
         dn = os.path.dirname(path)
-        if dn:
+        # A single stat is cheaper than letting makedirs fail on an existing directory
+        if dn and not os.path.isdir(dn):
             os.makedirs(dn, exist_ok=True)
         return True
     except OSError as err:
@@ -4612,6 +4716,7 @@ def make_dir(path, to_screen=None):
         return False
 
 
+@functools.cache
 def get_executable_path():
     from ..update import _get_variant_and_executable_path
 
@@ -4655,12 +4760,13 @@ def jwt_encode_hs256(payload_data, key, headers={}):
     }
     if headers:
         header_data.update(headers)
-    header_b64 = base64.b64encode(json.dumps(header_data).encode())
-    payload_b64 = base64.b64encode(json.dumps(payload_data).encode())
-    h = hmac.new(key.encode(), header_b64 + b'.' + payload_b64, hashlib.sha256)
-    signature_b64 = base64.b64encode(h.digest())
-    token = header_b64 + b'.' + payload_b64 + b'.' + signature_b64
-    return token
+    # JWS uses unpadded base64url for each part of the token
+    b64 = lambda data: base64.urlsafe_b64encode(data).rstrip(b'=')
+    signing_input = b'.'.join((
+        b64(json.dumps(header_data, separators=(',', ':')).encode()),
+        b64(json.dumps(payload_data, separators=(',', ':')).encode())))
+    signature = hmac.new(key.encode(), signing_input, hashlib.sha256).digest()
+    return b'.'.join((signing_input, b64(signature)))
 
 
 # can be extended in future to verify the signature and parse header and return the algorithm used if it's not HS256
@@ -4719,7 +4825,8 @@ def windows_enable_vt_mode():
     supports_terminal_sequences.cache_clear()
 
 
-_terminal_sequences_re = re.compile('\033\\[[^m]+m')
+# CSI sequences: parameter bytes, intermediate bytes and a single final byte
+_terminal_sequences_re = re.compile(r'\033\[[0-?]*[ -/]*[@-~]')
 
 
 def remove_terminal_sequences(string):
@@ -4798,6 +4905,9 @@ class Config:
     filename = None
     __initialized = False
 
+    _PRIVATE_OPTS = frozenset(('-p', '--password', '-u', '--username', '--video-password', '--ap-password', '--ap-username'))
+    _PRIVATE_OPTS_EQ_RE = re.compile('^(?P<key>' + '|'.join(map(re.escape, _PRIVATE_OPTS)) + ')=.+$')
+
     def __init__(self, parser, label=None):
         self.parser, self.label = parser, label
         self._loaded_paths, self.configs = set(), []
@@ -4831,6 +4941,8 @@ def load_configs(self):
                 location = os.path.join(location, 'yt-dlp.conf')
             if not os.path.exists(location):
                 self.parser.error(f'config location {location} does not exist')
+            if os.path.realpath(location) in self._loaded_paths:
+                continue
             self.append_config(self.read_file(location), location)
         return True
 
@@ -4864,21 +4976,16 @@ def read_file(filename, default=[]):
             optionf.close()
         return res
 
-    @staticmethod
-    def hide_login_info(opts):
-        PRIVATE_OPTS = {'-p', '--password', '-u', '--username', '--video-password', '--ap-password', '--ap-username'}
-        eqre = re.compile('^(?P<key>' + ('|'.join(re.escape(po) for po in PRIVATE_OPTS)) + ')=.+$')
-
-        def _scrub_eq(o):
-            m = eqre.match(o)
-            if m:
-                return m.group('key') + '=PRIVATE'
-            else:
-                return o
+    @classmethod
+    def hide_login_info(cls, opts):
+        PRIVATE_OPTS, eqmatch = cls._PRIVATE_OPTS, cls._PRIVATE_OPTS_EQ_RE.match
 
-        opts = list(map(_scrub_eq, opts))
+        opts = list(opts)
         for idx, opt in enumerate(opts):
-            if opt in PRIVATE_OPTS and idx + 1 < len(opts):
+            m = eqmatch(opt)
+            if m:
+                opts[idx] = m.group('key') + '=PRIVATE'
+            elif opt in PRIVATE_OPTS and idx + 1 < len(opts):
                 opts[idx + 1] = 'PRIVATE'
         return opts
 
@@ -3,7 +3,7 @@
 import urllib.parse
 import urllib.request
 
-from ._utils import remove_start
+from ._utils import _cached_urlparse, _idna_encode, remove_start
 
 
 def random_user_agent():
@@ -153,9 +153,10 @@ def escape_rfc3986(s):
 
 def normalize_url(url):
     """Normalize URL as suggested by RFC 3986"""
-    url_parsed = urllib.parse.urlparse(url)
+    url_parsed = _cached_urlparse(url)
+    netloc = url_parsed.netloc
     return url_parsed._replace(
-        netloc=url_parsed.netloc.encode('idna').decode('ascii'),
+        netloc=netloc if netloc.isascii() else _idna_encode(netloc),
         path=escape_rfc3986(remove_dot_segments(url_parsed.path)),
         params=escape_rfc3986(url_parsed.params),
         query=escape_rfc3986(url_parsed.query),
@@ -1,7 +1,9 @@
 import collections.abc
 import contextlib
+import functools
 import inspect
 import itertools
+import operator
 import re
 
 from ._utils import (
@@ -87,6 +89,19 @@ def traverse_obj(
     else:
         type_test = lambda val: try_call(expected_type or IDENTITY, args=(val,))
 
+    casefolded_cache = {}
+
+    def casefolded(obj):
+        # Build the case insensitive index of a mapping once per call instead of scanning it for every key.
+        # The mapping itself is kept alongside so that its id cannot be reused while the cache is alive
+        cached = casefolded_cache.get(id(obj))
+        if not cached or cached[0] is not obj:
+            index = {}
+            for k, v in obj.items():
+                index.setdefault(casefold(k), v)
+            cached = casefolded_cache[id(obj)] = obj, index
+        return cached[1]
+
     def apply_key(key, obj, is_last):
         branching = False
         result = None
@@ -154,9 +169,13 @@ def apply_key(key, obj, is_last):
                 if v is not None or default is not NO_DEFAULT
             } or None
 
+        elif casesense and type(obj) is dict and type(key) is str:
+            # Most common case; a plain `dict.get` with a `str` key cannot raise
+            result = obj.get(key)
+
         elif isinstance(obj, collections.abc.Mapping):
             result = (try_call(obj.get, args=(key,)) if casesense or try_call(obj.__contains__, args=(key,)) else
-                      next((v for k, v in obj.items() if casefold(k) == key), None))
+                      try_call(casefolded(obj).get, args=(key,)))
 
         elif isinstance(obj, re.Match):
             if isinstance(key, int) or casesense:
@@ -210,11 +229,15 @@ def apply_path(start_obj, path, test_type):
                 # Verify function signature
                 inspect.signature(key).bind(None, None)
 
-            new_objs = []
-            for obj in objs:
-                branching, results = apply_key(key, obj, last)
-                has_branched |= branching
-                new_objs.append(results)
+            if get_all:
+                new_objs = []
+                for obj in objs:
+                    branching, results = apply_key(key, obj, last)
+                    has_branched |= branching
+                    new_objs.append(results)
+            else:
+                # Only the first result is used; apply keys lazily so that traversal stops there
+                new_objs = map(operator.itemgetter(1), map(functools.partial(apply_key, key, is_last=last), objs))
 
             objs = itertools.chain.from_iterable(new_objs)
 
@@ -248,7 +271,12 @@ def get_first(obj, *paths, **kwargs):
 
 
 def dict_get(d, key_or_keys, default=None, skip_false_values=True):
-    for val in map(d.get, variadic(key_or_keys)):
+    # Avoid the comparatively slow ABC check in variadic for the common argument types
+    if isinstance(key_or_keys, str):
+        key_or_keys = (key_or_keys, )
+    elif not isinstance(key_or_keys, (list, tuple)):
+        key_or_keys = variadic(key_or_keys)
+    for val in map(d.get, key_or_keys):
         if val is not None and (val or not skip_false_values):
             return val
     return default